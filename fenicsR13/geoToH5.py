@@ -29,6 +29,8 @@ Append "-3" to the gmsh CLI arguments like:
 
 import os
 import sys
+import shlex
+import subprocess
 import dolfin as df
 from datetime import datetime
 import random
@@ -56,33 +58,42 @@ E.g.: geoToH5 lid.geo lid5.h5 "-setnumber p 5"
     gmsh_arguments = sys.argv[3] if len(sys.argv) == 4 else ""
     tmp_name = "tmp_" + str(datetime.now().time()) + str(random.random())
 
-    # Create msh-mesh with Gmsh
-    os.system(
-        "{} -2 {} -o {}.msh {}".format(
-            GMSH_PATH, gmsh_arguments, tmp_name, geo_input_file
+    try:
+        # Create msh-mesh with Gmsh (no shell involved, fail on errors)
+        subprocess.run(
+            [
+                GMSH_PATH, "-2", *shlex.split(gmsh_arguments),
+                "-o", "{}.msh".format(tmp_name), geo_input_file
+            ],
+            check=True
         )
-    )
-
-    # Convert msh-mesh to xml-mesh
-    os.system("dolfin-convert {0}.msh {0}.xml".format(tmp_name))
-
-    # Read xml-mesh
-    mesh = df.Mesh("{}.xml".format(tmp_name))
-    subdomains = df.MeshFunction(
-        "size_t", mesh, "{}_physical_region.xml".format(tmp_name))
-    boundaries = df.MeshFunction(
-        "size_t", mesh, "{}_facet_region.xml".format(tmp_name))
-
-    # Write h5-mesh
-    file = df.HDF5File(mesh.mpi_comm(), h5_output_file, "w")
-    file.write(mesh, "/mesh")
-    file.write(subdomains, "/subdomains")
-    file.write(boundaries, "/boundaries")
-
-    # Delete msh-mesh
-    os.remove("{}.msh".format(tmp_name))
-
-    # Delete xml-mesh
-    os.remove("{}.xml".format(tmp_name))
-    os.remove("{}_physical_region.xml".format(tmp_name))
-    os.remove("{}_facet_region.xml".format(tmp_name))
+
+        # Convert msh-mesh to xml-mesh
+        subprocess.run(
+            ["dolfin-convert", "{}.msh".format(tmp_name),
+             "{}.xml".format(tmp_name)],
+            check=True
+        )
+
+        # Read xml-mesh
+        mesh = df.Mesh("{}.xml".format(tmp_name))
+        subdomains = df.MeshFunction(
+            "size_t", mesh, "{}_physical_region.xml".format(tmp_name))
+        boundaries = df.MeshFunction(
+            "size_t", mesh, "{}_facet_region.xml".format(tmp_name))
+
+        # Write h5-mesh
+        file = df.HDF5File(mesh.mpi_comm(), h5_output_file, "w")
+        file.write(mesh, "/mesh")
+        file.write(subdomains, "/subdomains")
+        file.write(boundaries, "/boundaries")
+    finally:
+        # Delete the msh- and xml-meshes, also if a conversion step failed
+        for tmp_file in [
+            "{}.msh".format(tmp_name),
+            "{}.xml".format(tmp_name),
+            "{}_physical_region.xml".format(tmp_name),
+            "{}_facet_region.xml".format(tmp_name)
+        ]:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
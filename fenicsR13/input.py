@@ -59,6 +59,13 @@ class Input:
         #     - tau_mass: Stabilization with mass eq. residual
         #     - tau_momentum: Stabilization with momentum eq. residual
         #     - tau_stress: Stabilization with stress eq. residual
+        # - quadrature_degree: Optional fixed quadrature degree for all forms
+        #   (if omitted, the form compiler estimates it from the integrands,
+        #   "auto" uses two times the highest element degree of the fields of
+        #   the current mode, coefficients are not taken into account)
+        # - block_preconditioner: Optional, use a block-diagonal preconditioner
+        #   for iterative PETSc solvers (only for mode==heat, needs a Krylov
+        #   ksp_type like gmres or fgmres, the system is not symmetric)
         elements:
           theta:
             shape: Lagrange
@@ -88,6 +95,8 @@ class Input:
             tau_mass: 0.01
             tau_momentum: 0.01
             tau_stress: 0.01
+        # quadrature_degree: 4
+        # block_preconditioner: False
 
         # Formulation Parameters
         # ======================
@@ -333,6 +342,17 @@ class Input:
                     "maxlength": 3
                 }
             },
+            "quadrature_degree": {
+                "required": False,
+                "anyof": [
+                    {"type": "integer", "min": 1},
+                    {"type": "string", "allowed": ["auto"]}
+                ]
+            },
+            "block_preconditioner": {
+                "type": "boolean",
+                "required": False
+            },
             "petsc_options": {
                 "type": "dict",
                 "required": True
@@ -10,7 +10,9 @@ For usage examples, see the :class:`solver.Solver` description.
 
 import sys
 import os
+import re
 import copy
+import functools
 import time as time_module
 import dolfin as df
 import ufl
@@ -18,6 +20,21 @@ import numpy as np
 from petsc4py import PETSc
 import fenicsR13.tensoroperations as to
 
+# Form compiler settings for the system forms. They are part of the JIT
+# signature, so keeping them fixed lets all Solver instances share kernels.
+FORM_COMPILER_PARAMETERS = {
+    "representation": "uflacs",
+    "optimize": True,
+    "cpp_optimize": True,
+    "cpp_optimize_flags": "-O3",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_cpp_code(cpp_code):
+    """Compile the given C++ code only once per process."""
+    return df.compile_cpp_code(cpp_code)
+
 
 class Solver:
     r"""
@@ -71,6 +88,12 @@ class Solver:
         self.cell = self.mesh.ufl_cell()
         self.time = time
         self.mode = params["mode"]
+        # Only the fields of the current mode enter the system forms
+        self.active_fields = {
+            "heat": ["theta", "s"],
+            "stress": ["p", "u", "sigma"],
+            "r13": ["theta", "s", "p", "u", "sigma"],
+        }[self.mode]
         self.nsd = params["nsd"]
         self.comm = df.MPI.comm_world
         self.rank = df.MPI.rank(self.comm)
@@ -90,6 +113,34 @@ class Solver:
         self.tau_stress = self.params["stabilization"]["gls"]["tau_stress"]
 
         self.petsc_options = self.params["petsc_options"]
+        self.block_preconditioner = self.params.get(
+            "block_preconditioner", False
+        )
+        if self.block_preconditioner and self.mode != "heat":
+            raise Exception("block_preconditioner only works for heat")
+        if self.block_preconditioner and (
+            self.petsc_options.get("ksp_type", "preonly") == "preonly"
+        ):
+            # preonly would only apply the preconditioner: x = P^-1 b
+            raise Exception(
+                "block_preconditioner needs a Krylov ksp_type (e.g. gmres)"
+            )
+
+        # Form compiler settings, used once when compiling the system forms
+        self.form_compiler_parameters = dict(FORM_COMPILER_PARAMETERS)
+        # Optional fixed quadrature degree, otherwise estimated by FFC
+        self.quadrature_degree = self.params.get("quadrature_degree")
+        if self.quadrature_degree == "auto":
+            # Two times the highest degree of the active fields, this does not
+            # account for the (degree 2) coefficients in the integrands
+            self.quadrature_degree = 2 * max(
+                self.params["elements"][var]["degree"]
+                for var in self.active_fields
+            )
+        if self.quadrature_degree is not None:
+            self.form_compiler_parameters["quadrature_degree"] = (
+                self.quadrature_degree
+            )
 
         self.write_pdfs = self.params["postprocessing"]["write_pdfs"]
         self.write_vecs = self.params["postprocessing"]["write_vecs"]
@@ -150,6 +201,7 @@ class Solver:
             "u": None,
             "sigma": None,
         }
+        self.sigma_full_fspace = None  # unsymmetric sigma for postprocessing
         self.mxd_elems = {
             "heat": None,
             "stress": None,
@@ -162,6 +214,13 @@ class Solver:
         }
         self.form_lhs = None
         self.form_rhs = None
+        self.form_pc = None
+        self.system_assembler = None
+        self.lhs_matrix = None
+        self.rhs_vector = None
+        self.pc_matrix = None
+        self.linear_solver = None
+        self.volume = None
         self.sol = {
             "theta": None,
             "s": None,
@@ -217,6 +276,20 @@ class Solver:
             sigmayy=self.sol["sigma"].split()[2]
         )
 
+    @staticmethod
+    def __expand_macros(cpp_string):
+        """
+        Replace the ``R`` and ``phi`` macros by their C++ definitions.
+
+        See Also
+        --------
+        _Solver__createMacroScaExpr
+        """
+        cpp_string = re.sub(
+            r"\bR\b", "sqrt(pow(x[0],2)+pow(x[1],2))", str(cpp_string)
+        )
+        return re.sub(r"\bphi\b", "atan2(x[1],x[0])", cpp_string)
+
     def __createMacroScaExpr(self, cpp_string):
         """
         Return a DOLFIN scalar expression with predefined macros.
@@ -230,28 +303,21 @@ class Solver:
         Angle wrt. :math:`(0,0)`     ``phi`` ``atan2(x[1],x[0])``
         ============================ ======= =================================
 
-        The following expressions are therefore equal:
+        The macros are expanded into the C++ string before compilation, so
+        only one expression is compiled and evaluated. The following
+        expressions are therefore equal:
 
         .. code-block:: python
 
             # expr1 is equal to expr2
             expr1 = self.__createMacroScaExpr("R*cos(phi)")
             expr2 = dolfin.Expression(
-                "R*cos(phi)",
-                degree=2,
-                R=dolfin.Expression("sqrt(pow(x[0],2)+pow(x[1],2))", degree=2),
-                phi=dolfin.Expression("atan2(x[1],x[0])", degree=2),
+                "sqrt(pow(x[0],2)+pow(x[1],2))*cos(atan2(x[1],x[0]))",
+                degree=2
             )
         """
         # TODO: Check for constants and then use df.Constant
-        R = df.Expression("sqrt(pow(x[0],2)+pow(x[1],2))", degree=2)
-        phi = df.Expression("atan2(x[1],x[0])", degree=2)
-        return df.Expression(
-            str(cpp_string),
-            degree=2,
-            phi=phi,
-            R=R
-        )
+        return df.Expression(self.__expand_macros(cpp_string), degree=2)
 
     def __createMacroVecExpr(self, cpp_strings):
         """
@@ -270,19 +336,9 @@ class Solver:
         --------
         _Solver__createMacroScaExpr
         """
-        R = df.Expression("sqrt(pow(x[0],2)+pow(x[1],2))", degree=2)
-        phi = df.Expression("atan2(x[1],x[0])", degree=2)
         # TODO Handle R, phi for 3D case => raise error?
-        cpp_strings = [str(i) for i in cpp_strings]
-        if len(cpp_strings) == 2:
-            return df.Expression(
-                cpp_strings,  # strange that no cast to list is needed
-                degree=2,
-                phi=phi,
-                R=R
-            )
-        else:
-            return df.Expression(cpp_strings, degree=2)
+        cpp_strings = [self.__expand_macros(i) for i in cpp_strings]
+        return df.Expression(cpp_strings, degree=2)
 
     def __createMacroTenExpr(self, cpp_strings):
         """
@@ -301,19 +357,12 @@ class Solver:
         --------
         _Solver__createMacroScaExpr
         """
-        R = df.Expression("sqrt(pow(x[0],2)+pow(x[1],2))", degree=2)
-        phi = df.Expression("atan2(x[1],x[0])", degree=2)
         # TODO Handle R, phi for 3D case => raise error?
-        cpp_strings = [[str(el) for el in firstdim] for firstdim in cpp_strings]
-        if len(cpp_strings) == 2:
-            return df.Expression(
-                cpp_strings,  # strange that no cast to list is needed
-                degree=2,
-                phi=phi,
-                R=R
-            )
-        else:
-            return df.Expression(cpp_strings, degree=2)
+        cpp_strings = [
+            [self.__expand_macros(el) for el in firstdim]
+            for firstdim in cpp_strings
+        ]
+        return df.Expression(cpp_strings, degree=2)
 
     def __setup_function_spaces(self):
         """
@@ -367,54 +416,66 @@ class Solver:
                             # ]
                         }
                     )
-            self.fspaces[var] = df.FunctionSpace(msh, self.elems[var])
+            # Only the fields of the current mode need their own function space
+            if var in self.active_fields:
+                self.fspaces[var] = df.FunctionSpace(msh, self.elems[var])
+                if var == "sigma":
+                    # Shared by the sigma postprocessing in solve() and errors
+                    self.sigma_full_fspace = df.FunctionSpace(
+                        msh, df.TensorElement(e, cell, deg)
+                    )
 
         # Bundle elements per mode into `mxd_elems` dict
+        # Only the mixed space of the current mode is built with a dofmap
         # 1) heat
         heat_elems = [self.elems["theta"], self.elems["s"]]
         self.mxd_elems["heat"] = df.MixedElement(heat_elems)
-        self.mxd_fspaces["heat"] = df.FunctionSpace(
-            msh, self.mxd_elems["heat"]
-        )
         # 2) stress
         stress_elems = [self.elems["p"], self.elems["u"], self.elems["sigma"]]
         self.mxd_elems["stress"] = df.MixedElement(stress_elems)
-        self.mxd_fspaces["stress"] = df.FunctionSpace(
-            msh, self.mxd_elems["stress"]
-        )
         # 3) r13
         r13_elems = heat_elems + stress_elems
         self.mxd_elems["r13"] = df.MixedElement(r13_elems)
-        self.mxd_fspaces["r13"] = df.FunctionSpace(
-            msh, self.mxd_elems["r13"]
+
+        self.mxd_fspaces[self.mode] = df.FunctionSpace(
+            msh, self.mxd_elems[self.mode]
         )
 
     def __check_regions(self):
         """
         Check if all regions from the input mesh have params prescribed.
 
-        Raises an exception if one region is missing.
+        Raises an exception listing all missing regions.
         """
-        # TODO: Implement this
-        region_ids = self.regions.array()
-        regs_specified = list(self.regs.keys())
+        region_ids = np.unique(self.regions.array())
+        regs_specified = np.fromiter(
+            [0] + list(self.regs.keys()),  # inner zero allowed
+            dtype=region_ids.dtype
+        )
 
-        for reg_id in region_ids:
-            if reg_id not in [0] + regs_specified:  # inner zero allowed
-                raise Exception("Mesh region {} has no params!".format(reg_id))
+        missing = np.setdiff1d(region_ids, regs_specified)
+        if missing.size:
+            raise Exception(
+                "Mesh region(s) {} have no params!".format(missing.tolist())
+            )
 
     def __check_bcs(self):
         """
         Check if all boundaries from the input mesh have BCs prescribed.
 
-        Raises an exception if one BC is missing.
+        Raises an exception listing all missing BCs.
         """
-        boundary_ids = self.boundaries.array()
-        bcs_specified = list(self.bcs.keys())
+        boundary_ids = np.unique(self.boundaries.array())
+        bcs_specified = np.fromiter(
+            [0] + list(self.bcs.keys()),  # inner zero allowed
+            dtype=boundary_ids.dtype
+        )
 
-        for edge_id in boundary_ids:
-            if edge_id not in [0] + bcs_specified:  # inner zero allowed
-                raise Exception("Mesh edge {} has no bcs!".format(edge_id))
+        missing = np.setdiff1d(boundary_ids, bcs_specified)
+        if missing.size:
+            raise Exception(
+                "Mesh edge(s) {} have no bcs!".format(missing.tolist())
+            )
 
     def normal(self):
         mesh1 = self.mesh
@@ -646,35 +707,63 @@ class Solver:
         df.dx = df.Measure("dx", domain=mesh, subdomain_data=regions)
         df.ds = df.Measure("ds", domain=mesh, subdomain_data=boundaries)
         df.dS = df.Measure("dS", domain=mesh, subdomain_data=boundaries)
+        # Single measures over all regions/bcs for parameter-free integrands
+        dx_regs = df.dx(tuple(regs.keys()))
+        ds_bcs = df.ds(tuple(bcs.keys()))
+
+        def sum_forms(forms):
+            # Build one Form from all integrals, instead of pairwise additions
+            return ufl.Form([
+                integral for form in forms for integral in form.integrals()
+            ])
 
         # Define mesh measuers
         h_msh = df.CellDiameter(mesh)
         h_avg = (h_msh("+") + h_msh("-")) / 2.0
+        h_avg3 = h_avg**3  # shared by the theta and u CIP terms
 
         # TODO: Study this, is it more precise?
         # fa = df.FacetArea(mesh)
         # h_avg_new = (fa("+") + fa("-"))/2.0
 
         # Setup trial and test functions
-        w_heat = self.mxd_fspaces["heat"]
-        w_stress = self.mxd_fspaces["stress"]
-        w_r13 = self.mxd_fspaces["r13"]
         if self.mode == "r13":
+            w_r13 = self.mxd_fspaces["r13"]
             (theta, s, p, u, sigma) = df.TrialFunctions(w_r13)
             (kappa, r, q, v, psi) = df.TestFunctions(w_r13)
         else:
             # Pure heat or pure stress: setup all functions..
-            (theta, s) = df.TrialFunctions(w_heat)
-            (kappa, r) = df.TestFunctions(w_heat)
-            (p, u, sigma) = df.TrialFunctions(w_stress)
-            (q, v, psi) = df.TestFunctions(w_stress)
+            # The other mode's functions only appear multiplied by cpl=0,
+            # which UFL reduces to Zero. They only need a UFL space without
+            # a DOLFIN dofmap.
+            if self.mode == "heat":
+                w_heat = self.mxd_fspaces["heat"]
+                (theta, s) = df.TrialFunctions(w_heat)
+                (kappa, r) = df.TestFunctions(w_heat)
+                w_stress = ufl.FunctionSpace(
+                    mesh.ufl_domain(), self.mxd_elems["stress"]
+                )
+                (p, u, sigma) = ufl.TrialFunctions(w_stress)
+                (q, v, psi) = ufl.TestFunctions(w_stress)
+            else:
+                w_heat = ufl.FunctionSpace(
+                    mesh.ufl_domain(), self.mxd_elems["heat"]
+                )
+                (theta, s) = ufl.TrialFunctions(w_heat)
+                (kappa, r) = ufl.TestFunctions(w_heat)
+                w_stress = self.mxd_fspaces["stress"]
+                (p, u, sigma) = df.TrialFunctions(w_stress)
+                (q, v, psi) = df.TestFunctions(w_stress)
 
         sigma = to.gen3DTFdim3(sigma)
         psi = to.gen3DTFdim3(psi)
 
         # Setup source functions
-        f_heat = self.heat_source
-        f_mass = self.mass_source
+        # The scalar sources are evaluated once per P2 dof instead of per cell.
+        # This is the same P2 interpolant the Expressions (degree=2) get.
+        sources_fspace = df.FunctionSpace(self.mesh, "Lagrange", 2)
+        f_heat = df.interpolate(self.heat_source, sources_fspace)
+        f_mass = df.interpolate(self.mass_source, sources_fspace)
         f_body = self.body_force
         f_sigma = self.f_sigma
         f_s = self.f_s
@@ -741,7 +830,7 @@ class Solver:
         def a(s, r):
             # Notes:
             # 4/5-24/75 = (60-24)/75 = 36/75 = 12/25
-            return sum([(
+            return sum_forms([(
                 # => 24/25*stf(grad)*grad
                 + 24 / 25 * regs[reg]["kn"] * df.inner(
                     df.sym(df.grad(s)), df.sym(df.grad(r))
@@ -749,7 +838,7 @@ class Solver:
                 - 24 / 75 * regs[reg]["kn"] * df.div(s) * df.div(r)
                 + 4 / 5 * incl_delta * regs[reg]["kn"] * df.div(s) * df.div(r)
                 + 4 / 15 * (1 / regs[reg]["kn"]) * df.inner(s, r)
-            ) * df.dx(reg) for reg in regs.keys()]) + sum([(
+            ) * df.dx(reg) for reg in regs.keys()]) + sum_forms([(
                 + 1 / (2 * bcs[bc]["chi_tilde"]) * n(s) * n(r)
                 + 11 / 25 * bcs[bc]["chi_tilde"] * t1(s) * t1(r)
                 + cpl * 1 / 25 * bcs[bc]["chi_tilde"] * t1(s) * t1(r)
@@ -760,11 +849,14 @@ class Solver:
         def d(si, ps):
             # Notes:
             # 21/20+3/40=45/40=9/8
-            return sum([(
-                + regs[reg]["kn"] * df.inner(
-                    to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(si), nsd)),
-                    to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(ps), nsd))
-                )
+            # Region-independent tensor expressions are only built once
+            inner_stf_grads = df.inner(
+                to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(si), nsd)),
+                to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(ps), nsd))
+            )
+            inner_tfs = df.inner(to.gen3DTFdim2(si), to.gen3DTFdim2(ps))
+            return sum_forms([(
+                + regs[reg]["kn"] * inner_stf_grads
                 # TODO: this one is equivalent to the above, document it!
                 # + regs[reg]["kn"] * df.inner(
                 #     to.sym3d3(to.grad3dOf2(to.gen3DTFdim2(si), nsd)),
@@ -774,10 +866,8 @@ class Solver:
                 #     df.div(si),
                 #     df.div(ps)
                 # )
-                + (1 / (2 * regs[reg]["kn"])) * df.inner(
-                    to.gen3DTFdim2(si), to.gen3DTFdim2(ps)
-                )
-            ) * df.dx(reg) for reg in regs.keys()]) + sum([(
+                + (1 / (2 * regs[reg]["kn"])) * inner_tfs
+            ) * df.dx(reg) for reg in regs.keys()]) + sum_forms([(
                 + bcs[bc]["chi_tilde"] * 21 / 20 * nn(si) * nn(ps)
                 + bcs[bc]["chi_tilde"] * cpl * 3 / 40 * nn(si) * nn(ps)
                 + bcs[bc]["chi_tilde"] * (
@@ -791,15 +881,15 @@ class Solver:
             ) * df.ds(bc) for bc in bcs.keys()])
 
         def h(p, q):
-            return sum([(
+            return sum_forms([(
                 bcs[bc]["epsilon_w"] * bcs[bc]["chi_tilde"] * p * q
             ) * df.ds(bc) for bc in bcs.keys()])
 
         # 2) Offdiagonals:
         def b(th, r):
-            return sum([(
+            return (
                 th * df.div(r)
-            ) * df.dx(reg) for reg in regs.keys()])
+            ) * dx_regs
         #     return sum([(  # form 2
         #         - df.inner(r, df.grad(th))
         #     ) * df.dx(reg) for reg in regs.keys()]) + sum([(
@@ -807,18 +897,18 @@ class Solver:
         #     ) * df.ds(bc) for bc in bcs.keys()])
 
         def c(r, si):
-            return cpl * (sum([(
+            return cpl * ((
                 2 / 5 * df.inner(si, df.grad(r))
-            ) * df.dx(reg) for reg in regs.keys()]) - sum([(
+            ) * dx_regs - (
                 3 / 20 * nn(si) * n(r)
                 + 1 / 5 * nt1(si) * t1(r)
                 + 1 / 5 * nt2(si) * t2(r)
-            ) * df.ds(bc) for bc in bcs.keys()]))
+            ) * ds_bcs)
 
         def e(u, ps):
-            return sum([(
+            return (
                 df.dot(df.div(ps), u)
-            ) * df.dx(reg) for reg in regs.keys()])
+            ) * dx_regs
             # return sum([(  # form 2
             #     - df.inner(ps, df.grad(u))
             # ) * df.dx(reg) for reg in regs.keys()]) + sum([(
@@ -826,14 +916,14 @@ class Solver:
             # ) * df.ds(bc) for bc in bcs.keys()])
 
         def f(p, ps):
-            return sum([(
+            return sum_forms([(
                 bcs[bc]["epsilon_w"] * bcs[bc]["chi_tilde"] * p * nn(ps)
             ) * df.ds(bc) for bc in bcs.keys()])
 
         def g(p, v):
-            return sum([(
+            return (
                 df.inner(v, df.grad(p))
-            ) * df.dx(reg) for reg in regs.keys()])
+            ) * dx_regs
         #     return sum([(  # form 2
         #         - df.div(v) * p
         #     ) * df.dx(reg) for reg in regs.keys()]) + sum([(
@@ -843,13 +933,13 @@ class Solver:
         # 3.1) CIP Stabilization:
         def j_theta(theta, kappa):
             return (
-                + delta_theta * h_avg**3 *
+                + delta_theta * h_avg3 *
                 df.jump(df.grad(theta), n_vec) * df.jump(df.grad(kappa), n_vec)
             ) * df.dS
 
         def j_u(u, v):
             return (
-                + delta_u * h_avg**3 *
+                + delta_u * h_avg3 *
                 df.dot(df.jump(df.grad(u), n_vec), df.jump(df.grad(v), n_vec))
             ) * df.dS
 
@@ -861,7 +951,9 @@ class Solver:
 
         # 3.2) GLS Stabilization
         def gls_heat(theta, kappa, s, r):
-            return sum([(
+            div_stf_grad_s = df.div(to.stf3d2(df.grad(s)))
+            div_stf_grad_r = df.div(to.stf3d2(df.grad(r)))
+            return sum_forms([(
                 tau_energy * h_msh**1 * (
                     df.inner(
                         df.div(s) + cpl * df.div(u) - f_heat,
@@ -871,18 +963,24 @@ class Solver:
                 + tau_heatflux * h_msh**1 *
                 df.inner(
                     (5 / 2) * df.grad(theta)
-                    - (12 / 5) * regs[reg]["kn"] * df.div(to.stf3d2(df.grad(s)))
+                    - (12 / 5) * regs[reg]["kn"] * div_stf_grad_s
                     - (1 / 6) * regs[reg]["kn"] * 12 * df.grad(df.div(s))
                     + 1 / regs[reg]["kn"] * 2 / 3 * s,
                     (5 / 2) * df.grad(kappa)
-                    - (12 / 5) * regs[reg]["kn"] * df.div(to.stf3d2(df.grad(r)))
+                    - (12 / 5) * regs[reg]["kn"] * div_stf_grad_r
                     - (1 / 6) * regs[reg]["kn"] * 12 * df.grad(df.div(r))
                     + 1 / regs[reg]["kn"] * 2 / 3 * r
                 )  # heatflux
             ) * df.dx(reg) for reg in regs.keys()])
 
         def gls_stress(p, q, u, v, sigma, psi):
-            return sum([(
+            div_stf_grad_psi = to.div3d3(
+                to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(psi), nsd))
+            )
+            div_stf_grad_sigma = to.div3d3(
+                to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(sigma), nsd))
+            )
+            return sum_forms([(
                 tau_mass * h_msh**1.5 *
                 df.inner(
                     df.div(v), df.div(u) - f_mass
@@ -896,15 +994,11 @@ class Solver:
                 df.inner(
                     cpl * (4 / 5) * to.gen3DTFdim2(df.grad(r))
                     + 2 * to.stf3d2(to.gen3d2(df.grad(v)))
-                    - 2 * regs[reg]["kn"] * to.div3d3(
-                        to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(psi), nsd))
-                    )
+                    - 2 * regs[reg]["kn"] * div_stf_grad_psi
                     + (1 / regs[reg]["kn"]) * to.gen3DTFdim2(psi),
                     cpl * (4 / 5) * to.gen3DTFdim2(df.grad(s))
                     + 2 * to.stf3d2(to.gen3d2(df.grad(u)))
-                    - 2 * regs[reg]["kn"] * to.div3d3(
-                        to.stf3d3(to.grad3dOf2(to.gen3DTFdim2(sigma), nsd))
-                    )
+                    - 2 * regs[reg]["kn"] * div_stf_grad_sigma
                     + (1 / regs[reg]["kn"]) * to.gen3DTFdim2(sigma)
                 )  # stress
             ) * df.dx(reg) for reg in regs.keys()])
@@ -942,14 +1036,14 @@ class Solver:
         A[3] = 0           + 0           + e(v, sigma)   + 0         + g(p, v)
         A[4] = 0           + 0           + f(q, sigma)   - g(q, u)   + h(p, q)
         # 2) Right-hand sides, linear functional L[..]:
-        L[0] = + df.dot(f_s, r) * df.dx - sum([(
+        L[0] = + df.dot(f_s, r) * df.dx - sum_forms([(
             bcs[bc]["theta_w"] * n(r)
         ) * df.ds(bc) for bc in bcs.keys()])
         # Use div(u)=f_mass to remain sym. (density-form doesnt need this):
         L[1] = (f_heat - cpl * f_mass) * kappa * df.dx
         L[2] = + df.inner(
             to.gen3DTFdim2(f_sigma), to.gen3DTFdim2(psi)
-        ) * df.dx - sum([(
+        ) * df.dx - sum_forms([(
             + t1(v1[bc]) * nt1(psi)
             + t2(v1[bc]) * nt2(psi)
             + (
@@ -958,7 +1052,7 @@ class Solver:
             ) * nn(psi)
         ) * df.ds(bc) for bc in bcs.keys()])
         L[3] = + df.dot(f_body, v) * df.dx
-        L[4] = + (f_mass * q) * df.dx - sum([(
+        L[4] = + (f_mass * q) * df.dx - sum_forms([(
             (
                 + n(v1[bc])
                 - bcs[bc]["epsilon_w"] * bcs[bc]["chi_tilde"] * bcs[bc]["p_w"]
@@ -997,6 +1091,39 @@ class Solver:
                 )
             )
 
+        # Block-diagonal preconditioner for iterative solvers: Heatflux block
+        # plus a Kn-scaled temperature mass matrix (and the CIP term).
+        # The system is not symmetric, use e.g. ksp_type=gmres or fgmres.
+        self.form_pc = None
+        if self.block_preconditioner:
+            self.form_pc = a(s, r) + sum_forms([(
+                (5 / 2)**2 * (1 / regs[reg]["kn"]) * theta * kappa
+            ) * df.dx(reg) for reg in regs.keys()]) + (
+                cip * j_theta(theta, kappa)
+            )
+
+        # Compile the forms once, all later assemblies reuse the JIT kernels
+        self.form_lhs = df.Form(
+            self.form_lhs,
+            form_compiler_parameters=self.form_compiler_parameters
+        )
+        self.form_rhs = df.Form(
+            self.form_rhs,
+            form_compiler_parameters=self.form_compiler_parameters
+        )
+        if self.form_pc is not None:
+            self.form_pc = df.Form(
+                self.form_pc,
+                form_compiler_parameters=self.form_compiler_parameters
+            )
+
+        # New forms (and function spaces) invalidate the assembled system
+        self.system_assembler = None
+        self.lhs_matrix = None
+        self.rhs_vector = None
+        self.pc_matrix = None
+        self.linear_solver = None
+
     def solve(self):
         """
         Solve the previously assembled system.
@@ -1061,8 +1188,24 @@ class Solver:
         print("Start assemble")
         sys.stdout.flush()
         start_t = time_module.time()
-        AA = df.assemble(self.form_lhs)
-        LL = df.assemble(self.form_rhs)
+        # Assemble LHS and RHS in one mesh traversal into persistent PETSc
+        # tensors: Repeated calls keep the sparsity pattern and only refill
+        # the numerical values
+        if self.system_assembler is None:
+            self.system_assembler = df.SystemAssembler(
+                self.form_lhs, self.form_rhs
+            )
+            self.lhs_matrix = df.PETScMatrix()
+            self.rhs_vector = df.PETScVector()
+            self.system_assembler.assemble(self.lhs_matrix, self.rhs_vector)
+        else:
+            # The LHS only changes in assemble(), only the RHS is reassembled
+            self.system_assembler.assemble(self.rhs_vector)
+        AA = self.lhs_matrix
+        LL = self.rhs_vector
+        if self.form_pc is not None and self.pc_matrix is None:
+            self.pc_matrix = df.PETScMatrix()
+            df.assemble(self.form_pc, tensor=self.pc_matrix)
         end_t = time_module.time()
         secs = end_t - start_t
         self.write_content_to_file("assemble", secs)
@@ -1108,16 +1251,25 @@ class Solver:
         # solver.parameters['monitor_convergence'] = True
         # solver.parameters['relative_tolerance'] = 1E-2
 
-        # Use PETSc solver with provided arguments
-        solver = df.PETScKrylovSolver()
-        opts = PETSc.Options()
-        if "log_view" in self.petsc_options.keys():
-            PETSc.Log().begin()
-        for key in self.petsc_options:
-            opts[key] = self.petsc_options[key]
-        print(opts.view())
-        solver.set_from_options()
-        solver.set_operator(AA)
+        # Use PETSc solver with provided arguments (setup only once)
+        if self.linear_solver is None:
+            self.linear_solver = df.PETScKrylovSolver()
+            opts = PETSc.Options()
+            if "log_view" in self.petsc_options.keys():
+                PETSc.Log().begin()
+            for key in self.petsc_options:
+                opts[key] = self.petsc_options[key]
+            print(opts.view())
+            self.linear_solver.set_from_options()
+            # Keep e.g. the LU factorization for repeated solves
+            self.linear_solver.set_reuse_preconditioner(True)
+            if self.petsc_options.get("pc_type") == "fieldsplit":
+                self.__set_fieldsplit_fields(w)
+        solver = self.linear_solver
+        if self.pc_matrix is not None:
+            solver.set_operators(AA, self.pc_matrix)
+        else:
+            solver.set_operator(AA)
         solver.solve(sol.vector(), LL)
 
         end_t = time_module.time()
@@ -1151,52 +1303,31 @@ class Solver:
             # -> See workaroud below...
 
             # This is a workaround: Make sigma a proper STF tensor
-            sp = df.TensorFunctionSpace(
-                self.mesh, self.params["elements"]["sigma"]["shape"],
-                self.params["elements"]["sigma"]["degree"]
-            )
+            sp = self.sigma_full_fspace
+            # Copy the independent components (collapsed, same element) into
+            # the full tensor space, no Expression evaluation per dof needed
             if self.nsd == 2:
-                sigmaxx, sigmaxy, sigmayy = self.sol["sigma"].split()
-                # strangely, the following is needed:
-                sigmaxx.set_allow_extrapolation(True)
-                sigmaxy.set_allow_extrapolation(True)
-                sigmayy.set_allow_extrapolation(True)
-                self.sol["sigma"] = df.interpolate(
-                    df.Expression(
-                        [
-                            ["sigmaxx", "sigmaxy"],
-                            ["sigmaxy", "sigmayy"],
-                        ],
-                        degree=2,
-                        sigmaxx=sigmaxx,
-                        sigmaxy=sigmaxy,
-                        sigmayy=sigmayy
-                    ), sp
-                )
+                sigmaxx, sigmaxy, sigmayy = self.sol["sigma"].split(True)
+                sigma_components = [sigmaxx, sigmaxy, sigmaxy, sigmayy]
             elif self.nsd == 3:
                 sigmaxx, sigmaxy, sigmaxz, sigmayy, sigmayz = (
-                    self.sol["sigma"].split()
-                )
-                sigmaxx.set_allow_extrapolation(True)
-                sigmaxy.set_allow_extrapolation(True)
-                sigmaxz.set_allow_extrapolation(True)
-                sigmayy.set_allow_extrapolation(True)
-                sigmayz.set_allow_extrapolation(True)
-                self.sol["sigma"] = df.interpolate(
-                    df.Expression(
-                        [
-                            ["sigmaxx", "sigmaxy", "sigmaxz"],
-                            ["sigmaxy", "sigmayy", "sigmayz"],
-                            ["sigmaxz", "sigmayz", "-sigmaxx-sigmayy"]
-                        ],
-                        degree=2,
-                        sigmaxx=sigmaxx,
-                        sigmaxy=sigmaxy,
-                        sigmaxz=sigmaxz,
-                        sigmayy=sigmayy,
-                        sigmayz=sigmayz
-                    ), sp
+                    self.sol["sigma"].split(True)
                 )
+                # Tracefree: sigmazz = -sigmaxx-sigmayy
+                sigmazz = sigmaxx.copy(deepcopy=True)
+                sigmazz_vec = sigmazz.vector()
+                sigmazz_vec.axpy(1.0, sigmayy.vector())
+                sigmazz_vec *= -1.0
+                sigma_components = [
+                    sigmaxx, sigmaxy, sigmaxz,
+                    sigmaxy, sigmayy, sigmayz,
+                    sigmaxz, sigmayz, sigmazz
+                ]
+            sigma_full = df.Function(sp)
+            df.FunctionAssigner(
+                sp, [comp.function_space() for comp in sigma_components]
+            ).assign(sigma_full, sigma_components)
+            self.sol["sigma"] = sigma_full
             end_t = time_module.time()
             secs = end_t - start_t
             print("Finished sigma projection: {}".format(str(secs)))
@@ -1206,7 +1337,9 @@ class Solver:
             if self.rescale_p is False:
                 print("No pressure rescaling applied.")
             else:
-                p_i = df.interpolate(self.sol["p"], self.fspaces["p"])
+                # Same element, a plain dof copy instead of an interpolation
+                p_i = df.Function(self.fspaces["p"])
+                df.assign(p_i, self.sol["p"])
                 shift = 0.0
                 if self.rescale_p == "zeromean":
                     shift = self.__calc_sf_mean(p_i)
@@ -1215,9 +1348,11 @@ class Solver:
                 else:
                     raise RuntimeError("Wrong rescale_pressure option.")
                 print("Pressure rescaling with shift=", shift)
-                shift_function = df.Function(self.fspaces["p"])
-                shift_function.assign(df.Constant(shift))
-                p_i.assign(p_i - shift_function)
+                unit_function = df.interpolate(
+                    df.Constant(1.0), self.fspaces["p"]
+                )
+                p_i.vector().axpy(-shift, unit_function.vector())
+                p_i.vector().apply("insert")
                 self.sol["p"] = p_i
 
         # Calculate mass flows
@@ -1226,15 +1361,17 @@ class Solver:
                 raise Exception("Massflow: {} is no boundary.".format(bc_id))
             n = df.FacetNormal(self.mesh)
             mass_flow_rate = df.assemble(
-                df.inner(self.sol["u"], n) * df.ds(bc_id)
+                df.inner(self.sol["u"], n) * df.ds(bc_id),
+                form_compiler_parameters=self.form_compiler_parameters
             )
             print("mass flow rate of BC", bc_id, ":", mass_flow_rate)
             self.write_content_to_file("massflow_" + str(bc_id), mass_flow_rate)
 
         if self.mode == "stress" or self.mode == "r13":
-            vol = df.assemble(df.Constant(1) * df.dx)
+            vol = self.__calc_volume()
             avgvel = df.assemble(
-                abs(df.inner(self.sol["u"], self.sol["u"])) * df.dx
+                abs(df.inner(self.sol["u"], self.sol["u"])) * df.dx,
+                form_compiler_parameters=self.form_compiler_parameters
             ) / vol
             print("avg vel:", avgvel)
             self.write_content_to_file("avgvel", avgvel)
@@ -1290,10 +1427,8 @@ class Solver:
         print("Start line_integrals")
         start_t = time_module.time()
         sys.stdout.flush()
-        for li in self.line_integrals:
-            name = li["name"]
-
-            # Interpolate in "best" Lagrange space
+        if self.line_integrals:
+            # Interpolate in "best" Lagrange space, shared by all integrals
             maxdeg = max([
                 self.params["elements"]["theta"]["degree"],
                 self.params["elements"]["s"]["degree"],
@@ -1301,9 +1436,12 @@ class Solver:
                 self.params["elements"]["u"]["degree"],
                 self.params["elements"]["sigma"]["degree"]
             ])
+            li_fspace = df.FunctionSpace(self.mesh, "Lagrange", maxdeg)
+        for li in self.line_integrals:
+            name = li["name"]
+
             expr = df.interpolate(
-                self.__createSolMacroScaExpr(li["expr"]),
-                df.FunctionSpace(self.mesh, "Lagrange", maxdeg)
+                self.__createSolMacroScaExpr(li["expr"]), li_fspace
             )
             start = np.array(li["start"])
             end = np.array(li["end"])
@@ -1420,13 +1558,15 @@ class Solver:
                 .def(py::init<>());
             }
         """
-        if self.mode == "heat" or self.mode == "r13":
+        if any(esol is not None for esol in self.esol.values()):
+            return  # already loaded and compiled for this solver
 
-            with open(self.exact_solution, "r") as file:
-                exact_solution_cpp_code = file.read()
+        with open(self.exact_solution, "r") as file:
+            exact_solution_cpp_code = file.read()
 
-            esol = df.compile_cpp_code(exact_solution_cpp_code)
+        esol = _compile_cpp_code(exact_solution_cpp_code)
 
+        if self.mode == "heat" or self.mode == "r13":
             self.esol["theta"] = df.CompiledExpression(
                 esol.Temperature(), degree=2
             )
@@ -1435,12 +1575,6 @@ class Solver:
                 esol.Heatflux(), degree=2
             )
         if self.mode == "stress" or self.mode == "r13":
-
-            with open(self.exact_solution, "r") as file:
-                exact_solution_cpp_code = file.read()
-
-            esol = df.compile_cpp_code(exact_solution_cpp_code)
-
             self.esol["p"] = df.CompiledExpression(
                 esol.Pressure(), degree=2
             )
@@ -1466,13 +1600,50 @@ class Solver:
             print(self.__calc_sf_mean(self.sol["p"]))
         """
         mean_val = (
-            df.assemble(scalar_function * df.dx) / (
-                df.assemble(df.Constant(1.0) * df.dx)
-            )
+            df.assemble(scalar_function * df.dx) / self.__calc_volume()
         )
         print("Calculated mean value:", mean_val)
         return mean_val
 
+    def __set_fieldsplit_fields(self, w):
+        """
+        Register the fields of the mixed space for a fieldsplit preconditioner.
+
+        In modes ``heat`` and ``stress``, every field is a separate split
+        (e.g. ``fieldsplit_s_``, ``fieldsplit_theta_``). In mode ``r13``, the
+        heat fields and the stress fields form the two splits ``heat`` and
+        ``stress``, such that e.g. ``pc_fieldsplit_type: schur`` can be used
+        in the ``petsc_options``. In mode ``heat``, the heatflux is the first
+        split, because the temperature block alone is singular (it only
+        contains the CIP term) and the Schur complement is taken for the
+        second split.
+        """
+        if self.mode == "heat":
+            splits = {"s": [1], "theta": [0]}
+        elif self.mode == "stress":
+            splits = {"p": [0], "u": [1], "sigma": [2]}
+        else:
+            splits = {"heat": [0, 1], "stress": [2, 3, 4]}
+        fields = [
+            (name, PETSc.IS().createGeneral(np.sort(np.concatenate(
+                [w.sub(i).dofmap().dofs() for i in subs]
+            )).astype(PETSc.IntType)))
+            for (name, subs) in splits.items()
+        ]
+        self.linear_solver.ksp().getPC().setFieldSplitIS(*fields)
+
+    def __calc_volume(self):
+        """
+        Calculate the volume of the computational domain.
+
+        The mesh is fixed for a solver, so the value is only assembled once.
+        """
+        if self.volume is None:
+            self.volume = df.assemble(
+                df.Constant(1.0) * df.dx(domain=self.mesh)
+            )
+        return self.volume
+
     def __calc_sf_min(self, scalar_function):
         """
         Calculate the minimum of a scalar function (works in parallel).
@@ -1483,6 +1654,21 @@ class Solver:
         print("Calculated minimum value:", min_val)
         return min_val
 
+    def __calc_L2_H1_norms(self, field):
+        r"""
+        Calculate the :math:`L_2` and :math:`H_1` norm of a field.
+
+        Equivalent to ``df.norm(field, "L2")`` and ``df.norm(field, "H1")``
+        but the :math:`L_2` integral is only assembled once and reused for
+        :math:`\|f\|_{H_1}^2 = \|f\|_{L_2}^2 + |f|_{H_1}^2`.
+        """
+        dx = df.dx(domain=field.function_space().mesh())
+        l2_sq = df.assemble(df.inner(field, field) * dx)
+        h1_semi_sq = df.assemble(
+            df.inner(df.grad(field), df.grad(field)) * dx
+        )
+        return np.sqrt(l2_sq), np.sqrt(l2_sq + h1_semi_sq)
+
     def __calc_field_errors(self, field_, field_e_, v_field, name_):
         r"""
         Calculate both :math:`L_2` and :math:`l_\infty` errors.
@@ -1537,77 +1723,85 @@ class Solver:
         """
         field_e_i = df.interpolate(field_e_, v_field)
         field_i = df.interpolate(field_, v_field)
-        error = df.Function(v_field)
-        error.assign(field_e_i - field_i)
+        # Both fields live in v_field, the difference is a pure vector update
+        error = field_e_i.copy(deepcopy=True)
+        error.vector().axpy(-1.0, field_i.vector())
+        error.vector().apply("insert")
 
-        err_f_L2_full = df.norm(error, "L2")
-        err_v_linf_full = df.MPI.max(self.comm, np.max(np.abs(
-            error.compute_vertex_values()
-        )))
-        err_f_H1_full = df.norm(error, "H1")
+        # Split only once, every split() call creates new sub-functions
+        field_e_parts = field_e_i.split()
+        error_parts = error.split()
+        dofs = len(field_e_parts) or 1
 
-        dofs = len(field_e_i.split()) or 1
+        # Vertex values of all components in one mesh traversal,
+        # reshaped to one row per component
+        error_vertex_values = error.compute_vertex_values().reshape(dofs, -1)
+        np.abs(error_vertex_values, out=error_vertex_values)
+
+        err_f_L2_full, err_f_H1_full = self.__calc_L2_H1_norms(error)
+        err_v_linf_full = df.MPI.max(self.comm, np.max(error_vertex_values))
 
         if dofs == 1:
-            # scalar
-            errs_f_L2 = [df.norm(error, "L2")]
-            errs_v_linf = [df.MPI.max(self.comm, np.max(np.abs(
-                error.compute_vertex_values()
-            )))]
-            errs_f_H1 = [df.norm(error, "H1")]
+            # scalar: component errors equal the full errors
+            errs_f_L2 = [err_f_L2_full]
+            errs_v_linf = [err_v_linf_full]
+            errs_f_H1 = [err_f_H1_full]
         else:
             # vector or tensor
-            errs_f_L2 = [df.norm(error.split()[i], "L2") for i in range(dofs)]
+            errs_f_L2_H1 = [
+                self.__calc_L2_H1_norms(error_parts[i]) for i in range(dofs)
+            ]
+            errs_f_L2 = [err[0] for err in errs_f_L2_H1]
             errs_v_linf = [
-                df.MPI.max(self.comm, np.max(np.abs(
-                    error.split()[i].compute_vertex_values()
-                )))
+                df.MPI.max(self.comm, np.max(error_vertex_values[i]))
                 for i in range(dofs)
             ]
-            errs_f_H1 = [df.norm(error.split()[i], "H1") for i in range(dofs)]
+            errs_f_H1 = [err[1] for err in errs_f_L2_H1]
 
         if self.relative_error:
             def wmsg(n):
                 return f"WARN: {name_} has zero {n}-norm, abs. error used"
+            # Same single traversal as for the error, one row per component
+            exact_vertex_values = (
+                field_e_i.compute_vertex_values().reshape(dofs, -1)
+            )
+            np.abs(exact_vertex_values, out=exact_vertex_values)
+            norms_full = self.__calc_L2_H1_norms(field_e_i)
             norm_f_L2_full = (
-                df.norm(field_e_i, "L2") or any([1, print(wmsg("L2"))])
+                norms_full[0] or any([1, print(wmsg("L2"))])
             )
             norm_v_linf_full = (
-                df.MPI.max(self.comm, np.max(
-                    np.abs(field_e_i.compute_vertex_values())
-                )) or any([1, print(wmsg("linf"))])
+                df.MPI.max(self.comm, np.max(exact_vertex_values))
+                or any([1, print(wmsg("linf"))])
             )
             norm_f_H1_full = (
-                df.norm(field_e_i, "H1") or any([1, print(wmsg("L2"))])
+                norms_full[1] or any([1, print(wmsg("L2"))])
             )
             if dofs == 1:
-                # scalar
-                norms_f_L2 = [
-                    df.norm(field_e_i, "L2") or any([1, print(wmsg("L2"))])
-                ]
-                norms_v_linf = [
-                    df.MPI.max(self.comm, np.max(
-                        np.abs(field_e_i.compute_vertex_values())
-                    ))
-                    or any([1, print(wmsg("linf"))])
-                ]
-                norms_f_H1 = [
-                    df.norm(field_e_i, "H1") or any([1, print(wmsg("H1"))])
-                ]
+                # scalar: component norms equal the full norms
+                norms_f_L2 = [norm_f_L2_full]
+                norms_v_linf = [norm_v_linf_full]
+                norms_f_H1 = [norm_f_H1_full]
             else:
                 # vector or tensor
-                norms_f_L2 = [df.norm(
-                    field_e_i.split()[i], "L2"
-                ) or any([1, print(wmsg("L2"))]) for i in range(dofs)]
+                norms_parts = [
+                    self.__calc_L2_H1_norms(field_e_parts[i])
+                    for i in range(dofs)
+                ]
+                norms_f_L2 = [
+                    norms[0] or any([1, print(wmsg("L2"))])
+                    for norms in norms_parts
+                ]
                 norms_v_linf = [
                     df.MPI.max(self.comm, np.max(
-                        np.abs(field_e_i.split()[i].compute_vertex_values())
+                        exact_vertex_values[i]
                     ) or any([1, print(wmsg("linf"))]))
                     for i in range(dofs)
                 ]
-                norms_f_H1 = [df.norm(
-                    field_e_i.split()[i], "H1"
-                ) or any([1, print(wmsg("H1"))]) for i in range(dofs)]
+                norms_f_H1 = [
+                    norms[1] or any([1, print(wmsg("H1"))])
+                    for norms in norms_parts
+                ]
             err_f_L2_full = err_f_L2_full / norm_f_L2_full
             err_v_linf_full = err_v_linf_full / norm_v_linf_full
             err_f_H1_full = err_f_H1_full / norm_f_H1_full
@@ -1661,10 +1855,6 @@ class Solver:
         sys.stdout.flush()
         start_t = time_module.time()
 
-        cell = self.cell
-        msh = self.mesh
-        e = self.params["elements"]["sigma"]["shape"]
-        deg = self.params["elements"]["sigma"]["degree"]
         self.__load_exact_solution()
 
         if self.mode == "heat" or self.mode == "r13":
@@ -1695,8 +1885,7 @@ class Solver:
             )
             te = self.__calc_field_errors(
                 self.sol["sigma"], self.esol["sigma"],
-                df.FunctionSpace(msh, df.TensorElement(
-                    e, cell, deg)), "sigma"
+                self.sigma_full_fspace, "sigma"
             )
             ers = self.errors
             if self.nsd == 2:
@@ -1826,22 +2015,26 @@ class Solver:
         Include writing of :math:`\mathbf{A}` and :math:`\mathbf{b}`
         of :math:`\mathbf{A} \mathbf{x} = \mathbf{b}`.
 
-        File-ending is `.mat`.
+        The matrix is written in the sparse MatrixMarket coordinate format
+        (file-ending `.mtx`), so only the nonzero entries are stored. The RHS
+        vector uses a plain text format (file-ending `.mat`).
 
         Import the matrices/vectors e.g. into Matlab with:
 
         .. code-block:: matlab
 
             % Input into MATLAB
-            A = table2array(readtable("A_0.mat","FileType","text"));
+            Aijv = readmatrix("A_0.mtx","FileType","text","NumHeaderLines",2);
+            A = sparse(Aijv(:,1),Aijv(:,2),Aijv(:,3));
             b = table2array(readtable("b_0.mat","FileType","text"));
 
         Julia:
 
         .. code-block:: julia
 
-            using DelimitedFiles
-            A = readdlm("A_0.mat", ' ', Float64, '\n')
+            using MatrixMarket, DelimitedFiles
+            A = MatrixMarket.mmread("A_0.mtx")
+            b = readdlm("b_0.mat", ' ', Float64, '\n')
 
         Example
         -------
@@ -1874,12 +2067,18 @@ class Solver:
         >>> solver.form_rhs = L
         >>> solver.output_folder = "./"
         >>> solver._Solver__write_discrete_system()
-        Write ./A_0.mat
+        Write ./A_0.mtx
         Write ./b_0.mat
-        >>> print(open("A_0.mat","r").read())
-        2.0000...00000e+00 -2.0000...00000e+00 0.000...000000e+00
-        -2.0000...00000e+00 4.0000...00000e+00 -2.0000...00000e+00
-        0.0000...00000e+00 -2.0000...00000e+00 2.000...000000e+00
+        >>> print(open("A_0.mtx","r").read())
+        %%MatrixMarket matrix coordinate real general
+        3 3 7
+        1 1 2.000000000000000000e+00
+        1 2 -2.000000000000000000e+00
+        2 1 -2.000000000000000000e+00
+        2 2 4.000000000000000000e+00
+        2 3 -2.000000000000000000e+00
+        3 2 -2.000000000000000000e+00
+        3 3 2.000000000000000000e+00
         <BLANKLINE>
         >>> print(open("b_0.mat","r").read())
         2.500000000000000000e-01
@@ -1887,13 +2086,58 @@ class Solver:
         2.500000000000000000e-01
         <BLANKLINE>
         """
-        file_ending = ".mat"
-        A_name = self.output_folder + "A_{}".format(self.time) + file_ending
-        b_name = self.output_folder + "b_{}".format(self.time) + file_ending
+        # Reuse the system from solve() if available to avoid reassembly
+        if self.lhs_matrix is not None:
+            lhs = self.lhs_matrix
+            rhs = self.rhs_vector
+        else:
+            lhs = df.assemble(self.form_lhs)
+            rhs = df.assemble(self.form_rhs)
+
+        if df.MPI.size(self.comm) > 1:
+            # Text output only sees the local rows, use PETSc binary in MPI
+            self.__write_discrete_system_binary(lhs, rhs)
+            return
+
+        A_name = self.output_folder + "A_{}".format(self.time) + ".mtx"
+        b_name = self.output_folder + "b_{}".format(self.time) + ".mat"
+
+        # Write only the nonzeros (CSR -> 1-based coordinate triplets)
+        mat = df.as_backend_type(lhs).mat()
+        (indptr, indices, values) = mat.getValuesCSR()
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        (num_rows, num_cols) = mat.getSize()
         print("Write {}".format(A_name))
-        np.savetxt(A_name, df.assemble(self.form_lhs).array())
+        np.savetxt(
+            A_name,
+            np.column_stack((rows + 1, indices + 1, values)),
+            fmt="%d %d %.18e",
+            header="%%MatrixMarket matrix coordinate real general\n"
+            + "{} {} {}".format(num_rows, num_cols, len(values)),
+            comments=""
+        )
         print("Write {}".format(b_name))
-        np.savetxt(b_name, df.assemble(self.form_rhs))
+        np.savetxt(b_name, rhs)
+
+    def __write_discrete_system_binary(self, lhs, rhs):
+        """
+        Write the discrete system in PETSc binary format (file-ending `.dat`).
+
+        All processes write collectively into one file. Load the files e.g.
+        with ``PetscBinaryRead.m`` (MATLAB) or ``PetscBinaryIO.py`` from the
+        PETSc distribution.
+        """
+        for (name, tensor) in [
+                ("A", df.as_backend_type(lhs).mat()),
+                ("b", df.as_backend_type(rhs).vec())
+        ]:
+            fname = self.output_folder + "{}_{}.dat".format(name, self.time)
+            print("Write {}".format(fname))
+            viewer = PETSc.Viewer().createBinary(
+                fname, mode="w", comm=tensor.getComm()
+            )
+            tensor.view(viewer)
+            viewer.destroy()
 
     def __write_xdmf(self, name, field, write_pdf):
         """
@@ -1943,7 +2187,8 @@ class Solver:
 
             if dimension > 0:
                 # skip scalars
-                components = len(field.split())
+                field_parts = field.split()
+                components = len(field_parts)
                 indexMap = {
                     1: {
                         1: "x",
@@ -1962,7 +2207,7 @@ class Solver:
                         self.output_folder + fieldname
                         + "_" + str(self.time) + ".pdf"
                     )
-                    plot = df.plot(field.split()[i])
+                    plot = df.plot(field_parts[i])
                     plt.colorbar(plot)
                     plt.xlabel("x")
                     plt.ylabel("y")
@@ -1990,7 +2235,8 @@ class Solver:
             print("Write {}".format(fname_mat))
         else:
             # vector or tensor
-            components = len(field.split())
+            field_parts = field.split()
+            components = len(field_parts)
             indexMap = {
                 1: {
                     1: "x",
@@ -2009,5 +2255,5 @@ class Solver:
                     self.output_folder + fieldname + "_" + str(self.time)
                     + ".mat"
                 )
-                np.savetxt(fname_mat, field.split()[i].compute_vertex_values())
+                np.savetxt(fname_mat, field_parts[i].compute_vertex_values())
                 print("Write {}".format(fname_mat))
@@ -152,11 +152,13 @@ def stf3d3(rank3_3d):
     i, j, k, L = ufl.indices(4)
     delta = df.Identity(3)
 
-    sym_ijk = sym3d3(rank3_3d)[i, j, k]
+    # Build the symmetric part only once and reuse it for all terms
+    sym = sym3d3(rank3_3d)
+    sym_ijk = sym[i, j, k]
     traces_ijk = 1 / 5 * (
-        + sym3d3(rank3_3d)[i, L, L] * delta[j, k]
-        + sym3d3(rank3_3d)[L, j, L] * delta[i, k]
-        + sym3d3(rank3_3d)[L, L, k] * delta[i, j]
+        + sym[i, L, L] * delta[j, k]
+        + sym[L, j, L] * delta[i, k]
+        + sym[L, L, k] * delta[i, j]
     )
     tracefree_ijk = sym_ijk - traces_ijk
     return ufl.as_tensor(tracefree_ijk, (i, j, k))
@@ -93,6 +93,74 @@ class TestHeatConvergence(object):
         referrors = "referrors/" + name + "/errors.csv"
         self.compare_errors(errors, referrors)
 
+    def test_heat_01_coeffs_p1p1_stab_blockpc(self):
+        r"""
+        Execute decoupled heat system test and check with reference errors.
+
+        Uses FGMRES with the block-diagonal preconditioner, the reference
+        errors are the ones of the direct solve.
+
+        ============= =======================
+        Parameter     Value
+        ============= =======================
+        :math:`Kn`    :math:`0.1`
+        Elements      :math:`P_1P_1`
+        Stabilization CIP, :math:`\delta_\theta=1`
+        Solver        FGMRES, block prec.
+        ============= =======================
+        """
+        name = "heat_01_coeffs_p1p1_stab_blockpc"
+        self.run_solver("inputs/" + name + ".yml")
+        errors = name + "/" + "errors.csv"
+        referrors = "referrors/" + name + "/errors.csv"
+        self.compare_errors(errors, referrors)
+
+    def test_heat_01_coeffs_p1p1_stab_quad4(self):
+        r"""
+        Execute decoupled heat system test and check with reference errors.
+
+        All integrands are polynomials of at most the given quadrature
+        degree, so the reference errors equal the ones of the default
+        (estimated) quadrature degree.
+
+        ============= =======================
+        Parameter     Value
+        ============= =======================
+        :math:`Kn`    :math:`0.1`
+        Elements      :math:`P_1P_1`
+        Stabilization CIP, :math:`\delta_\theta=1`
+        Quadrature    Degree 4
+        ============= =======================
+        """
+        name = "heat_01_coeffs_p1p1_stab_quad4"
+        self.run_solver("inputs/" + name + ".yml")
+        errors = name + "/" + "errors.csv"
+        referrors = "referrors/" + name + "/errors.csv"
+        self.compare_errors(errors, referrors)
+
+    def test_heat_01_coeffs_p1p1_stab_fieldsplit(self):
+        r"""
+        Execute decoupled heat system test and check with reference errors.
+
+        Uses FGMRES with a full Schur complement fieldsplit preconditioner
+        over the named splits ``s`` and ``theta``, the reference errors are
+        the ones of the direct solve.
+
+        ============= =======================
+        Parameter     Value
+        ============= =======================
+        :math:`Kn`    :math:`0.1`
+        Elements      :math:`P_1P_1`
+        Stabilization CIP, :math:`\delta_\theta=1`
+        Solver        FGMRES, fieldsplit
+        ============= =======================
+        """
+        name = "heat_01_coeffs_p1p1_stab_fieldsplit"
+        self.run_solver("inputs/" + name + ".yml")
+        errors = name + "/" + "errors.csv"
+        referrors = "referrors/" + name + "/errors.csv"
+        self.compare_errors(errors, referrors)
+
     def test_heat_10_coeffs_p2p2_stab(self):
         r"""
         Execute decoupled heat system test and check with reference errors.
@@ -129,6 +197,29 @@ class TestHeatConvergence(object):
         referrors = "referrors/" + name + "/errors.csv"
         self.compare_errors(errors, referrors)
 
+    def test_heat_01_coeffs_p2p2_stab_quadauto(self):
+        r"""
+        Execute decoupled heat system test and check with reference errors.
+
+        All integrands are polynomials of at most the given quadrature
+        degree, so the reference errors equal the ones of the default
+        (estimated) quadrature degree.
+
+        ============= =======================
+        Parameter     Value
+        ============= =======================
+        :math:`Kn`    :math:`0.1`
+        Elements      :math:`P_2P_2`
+        Stabilization CIP, :math:`\delta_\theta=1`
+        Quadrature    auto (degree 4)
+        ============= =======================
+        """
+        name = "heat_01_coeffs_p2p2_stab_quadauto"
+        self.run_solver("inputs/" + name + ".yml")
+        errors = name + "/" + "errors.csv"
+        referrors = "referrors/" + name + "/errors.csv"
+        self.compare_errors(errors, referrors)
+
     def test_heat_01_coeffs_p1p2_nostab(self):
         r"""
         Execute decoupled heat system test and check with reference errors.
@@ -1,9 +1,12 @@
 #!/bin/bash
 
+# Meshes are independent, generate them in parallel (at most one job per CPU)
+# xargs exits non-zero if any of the mesh generations failed
 for p in 0 1 2 3 4 5 6 7
 do
   for name in ring ring_antisym
   do
-    geoToH5 "$name".geo "$name""$p".h5 "-setnumber p $p"
+    echo "$name" "$p"
   done
-done
+done | xargs -L 1 -P "$(nproc)" \
+  sh -c 'geoToH5 "$0".geo "$0""$1".h5 "-setnumber p $1"'